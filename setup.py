@@ -55,6 +55,7 @@ setup(
     ],
     extras_require={
         "dev": [
+            "apipkg==1.5; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3'",
             "appdirs==1.4.4",
             "attrs==20.3.0; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3'",
             "black==19.10b0; python_version >= '3.6'",
@@ -66,6 +67,7 @@ setup(
             "colorama==0.4.4; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3, 3.4'",
             "coverage==5.3; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3, 3.4' and python_version < '4'",
             "distlib==0.3.1",
+            "execnet==1.7.1; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3'",
             "idna==2.10; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3'",
             "importlib-metadata==3.3.0; python_version < '3.8'",
             "iniconfig==1.1.1",
@@ -82,8 +84,10 @@ setup(
             "pyparsing==2.4.7; python_version >= '2.6' and python_version not in '3.0, 3.1, 3.2, 3.3'",
             "pytest==6.1.2",
             "pytest-cov==2.10.1",
+            "pytest-forked==1.3.0; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3, 3.4'",
             "pytest-httpserver==0.3.6",
             "pytest-mock==3.3.1",
+            "pytest-xdist==2.2.0",
             "python-dateutil==2.8.1; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3'",
             "regex==2020.11.13",
             "requests==2.25.1; python_version >= '2.7' and python_version not in '3.0, 3.1, 3.2, 3.3, 3.4'",
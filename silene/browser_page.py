@@ -16,6 +16,8 @@
 class BrowserPage:
     """Represents a page in the browser."""
 
+    __slots__ = ('_index', '_url', '_title')
+
     def __init__(self, index: int, url: str, title: str) -> None:
         """
         Creates a new page instance.
@@ -12,12 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, Union, Optional
+from types import MappingProxyType
+from typing import Dict, Union, Optional, Mapping
 
 
 class Cookie:
     """Represents an HTTP cookie."""
 
+    __slots__ = ('_name', '_value', '_domain', '_path', '_expires', '_http_only', '_secure', '_session', '_same_site',
+                 '_dict')
+
     def __init__(self,
                  name: str,
                  value: str,
@@ -53,6 +57,7 @@ class Cookie:
         self._secure = secure
         self._session = session
         self._same_site = same_site
+        self._dict = None
 
     @property
     def name(self) -> str:
@@ -144,34 +149,34 @@ class Cookie:
 
         return self._same_site
 
-    def as_dict(self) -> Dict[str, Union[str, int, bool]]:
+    def as_dict(self) -> Mapping[str, Union[str, int, bool]]:
         """
-        Returns the cookie as a dictionary.
+        Returns the cookie as a read-only dictionary.
         The dictionary will only contain specified attributes.
 
-        :return: the cookie as a dictionary
-        """
-
-        cookie_dict = {'name': self._name, 'value': self._value}
-
-        if self._domain is not None:
-            cookie_dict['domain'] = self._domain
-        if self._path is not None:
-            cookie_dict['path'] = self._path
-        if self._secure is not None:
-            cookie_dict['secure'] = self._secure
-        if self._expires is not None:
-            cookie_dict['expires'] = self._expires
-        if self._http_only is not None:
-            cookie_dict['httpOnly'] = self._http_only
-        if self._secure is not None:
-            cookie_dict['secure'] = self._secure
-        if self._session is not None:
-            cookie_dict['session'] = self._session
-        if self._same_site is not None:
-            cookie_dict['sameSite'] = self._same_site
-
-        return cookie_dict
+        :return: the cookie as a read-only dictionary
+        """
+
+        # The cookie is immutable, so the dictionary is built only once
+        if self._dict is None:
+            optional_attributes = (
+                ('domain', self._domain),
+                ('path', self._path),
+                ('expires', self._expires),
+                ('httpOnly', self._http_only),
+                ('secure', self._secure),
+                ('session', self._session),
+                ('sameSite', self._same_site)
+            )
+
+            # Callers get a read-only view, so the cached dictionary can be shared without copying it on each call
+            self._dict = MappingProxyType({
+                'name': self._name,
+                'value': self._value,
+                **{key: value for key, value in optional_attributes if value is not None}
+            })
+
+        return self._dict
 
     @staticmethod
     def from_dict(cookie_dict: Dict[str, Union[str, int, bool]]) -> 'Cookie':
@@ -11,14 +11,17 @@
 # limitations under the License.
 
 import heapq
-import re
-from hashlib import sha256
-from typing import Optional
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+import itertools
+import sys
+from hashlib import blake2b
+from typing import Optional, List
 
 from silene.crawl_request import CrawlRequest
 from silene.crawler_configuration import CrawlerConfiguration
 
+# The built-in string hash is only 32 bits wide on 32-bit builds, where collisions would silently drop distinct URLs
+_HAS_64_BIT_HASH = sys.hash_info.width >= 64
+
 
 class CrawlFrontier:
     """
@@ -37,12 +40,13 @@ class CrawlFrontier:
         """
 
         self._crawler_configuration = crawler_configuration
+        # Heap of (negated priority, insertion order, request) entries, so comparisons never reach the request itself
         self._requests = []
+        self._insertion_counter = itertools.count()
         self._url_hashes = set()
-        self._allowed_domain_pattern = re.compile(fr'^(?:.*\.)?({"|".join(crawler_configuration.allowed_domains)})$')
+        self._allowed_domains = frozenset(crawler_configuration.allowed_domains)
 
-        for request in crawler_configuration.seed_requests:
-            self.add_request(request)
+        self._add_seed_requests(crawler_configuration.seed_requests)
 
     def add_request(self, request: CrawlRequest) -> bool:
         """
@@ -52,18 +56,10 @@ class CrawlFrontier:
         :return: True if the request was added to the queue, False otherwise (filtered out)
         """
 
-        if self._crawler_configuration.filter_duplicate_requests:
-            url_hash = self._generate_url_hash(request.url)
-            if url_hash in self._url_hashes:
-                return False
-            else:
-                self._url_hashes.add(url_hash)
-
-        if self._crawler_configuration.filter_offsite_requests and not re.search(self._allowed_domain_pattern,
-                                                                                 request.domain):
+        if not self._is_eligible(request):
             return False
 
-        heapq.heappush(self._requests, request)
+        heapq.heappush(self._requests, (-request.priority, next(self._insertion_counter), request))
         return True
 
     def has_next_request(self) -> bool:
@@ -83,15 +79,46 @@ class CrawlFrontier:
         """
 
         try:
-            return heapq.heappop(self._requests)
+            return heapq.heappop(self._requests)[2]
         except IndexError:
             # If heap is empty
             return None
 
+    def _add_seed_requests(self, requests: List[CrawlRequest]) -> None:
+        # Builds the heap in linear time instead of pushing the requests one by one
+        self._requests.extend((-request.priority, next(self._insertion_counter), request) for request in requests
+                              if self._is_eligible(request))
+        heapq.heapify(self._requests)
+
+    def _is_eligible(self, request: CrawlRequest) -> bool:
+        if self._crawler_configuration.filter_duplicate_requests:
+            url_hash = self._generate_url_hash(request)
+            if url_hash in self._url_hashes:
+                return False
+            else:
+                self._url_hashes.add(url_hash)
+
+        if self._crawler_configuration.filter_offsite_requests and not self._is_allowed_domain(request.domain):
+            return False
+
+        return True
+
+    def _is_allowed_domain(self, domain: Optional[str]) -> bool:
+        # Looks up the domain and each of its parent domains, so the cost depends on the number of labels in the domain
+        # instead of the number of allowed domains
+        while domain:
+            if domain in self._allowed_domains:
+                return True
+
+            domain = domain.partition('.')[2]
+
+        return False
+
     @staticmethod
-    def _generate_url_hash(url: str) -> str:
-        url_parts = urlparse(url)
-        sorted_query_params = sorted(parse_qsl(url_parts.query), key=lambda param: (param[0], param[1]))
-        url_parts = url_parts._replace(query=urlencode(sorted_query_params), fragment='')
-        normalized_url = urlunparse(url_parts)
-        return sha256(str(normalized_url).encode('utf-8')).hexdigest()
+    def _generate_url_hash(request: CrawlRequest) -> int:
+        # A 64-bit fingerprint is sufficient for duplicate detection within a single crawl, the built-in string hash
+        # provides one on 64-bit builds without encoding the URL
+        if _HAS_64_BIT_HASH:
+            return hash(request.normalized_url)
+
+        return int.from_bytes(blake2b(request.normalized_url.encode('utf-8'), digest_size=8).digest(), 'little')
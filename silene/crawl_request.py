@@ -10,16 +10,51 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import re
+from functools import lru_cache
 from typing import Callable, TYPE_CHECKING, Dict, Optional
-from urllib.parse import urlparse
+from urllib.parse import urlparse, ParseResult, urlunparse, parse_qsl, urlencode
 
 if TYPE_CHECKING:
     from silene.crawl_response import CrawlResponse
 
 
+@lru_cache(maxsize=131072)
+def _cached_urlparse(url: str) -> ParseResult:
+    # The same URL is often parsed multiple times (e.g. merged redirect requests), so the results are memoized
+    return urlparse(url)
+
+
+_DEFAULT_PORT_SUFFIXES = {'http': ':80', 'https': ':443'}
+# Parsing drops empty query, fragment and params delimiters, and removes tabs and newlines
+_UNPARSE_CHANGING_CHARACTERS = re.compile('[?#;\t\r\n]')
+
+
+def _normalize_url(url: str, url_parts: ParseResult) -> str:
+    # Lowercases the host, removes the default port and the fragment, and sorts the query parameters
+    user_info, separator, host = url_parts.netloc.rpartition('@')
+    host = host.lower()
+    default_port_suffix = _DEFAULT_PORT_SUFFIXES.get(url_parts.scheme)
+    if default_port_suffix and host.endswith(default_port_suffix):
+        host = host[:-len(default_port_suffix)]
+    netloc = user_info + separator + host
+
+    # Without a query, fragment or params, a URL whose scheme and host are already normalized is returned as is, since
+    # unparsing would rebuild the same string
+    if url_parts.netloc and netloc == url_parts.netloc and url.startswith(url_parts.scheme + '://') \
+            and not _UNPARSE_CHANGING_CHARACTERS.search(url):
+        return url
+
+    sorted_query_params = sorted(parse_qsl(url_parts.query))
+    return urlunparse(url_parts._replace(netloc=netloc, query=urlencode(sorted_query_params), fragment=''))
+
+
 class CrawlRequest:
     """Represents an HTTP request which will be executed by the crawler."""
 
+    __slots__ = ('_url', '_domain', '_normalized_url', '_headers', '_priority', '_redirect_func', '_success_func',
+                 '_error_func')
+
     def __init__(
             self,
             url: str,
@@ -44,7 +79,9 @@ class CrawlRequest:
         """
 
         self._url = url
-        self._domain = urlparse(url).hostname
+        url_parts = _cached_urlparse(url)
+        self._domain = url_parts.hostname
+        self._normalized_url = None
         self._headers = headers if headers is not None else {}
         self._priority = priority
         self._redirect_func = redirect_func
@@ -90,6 +127,22 @@ class CrawlRequest:
 
         return self._domain
 
+    @property
+    def normalized_url(self) -> str:
+        """
+        Returns the normalized request URL.
+        The normalized URL is used to detect duplicate requests, it has a lowercase host, no default port, sorted
+        query parameters and no fragment.
+
+        :return: the normalized request URL
+        """
+
+        # Only needed when duplicate requests are filtered, so it is computed on first access
+        if self._normalized_url is None:
+            self._normalized_url = _normalize_url(self._url, _cached_urlparse(self._url))
+
+        return self._normalized_url
+
     @property
     def headers(self) -> Optional[Dict[str, str]]:
         """
@@ -140,16 +193,6 @@ class CrawlRequest:
 
         return self._error_func
 
-    def __lt__(self, other: 'CrawlRequest') -> bool:
-        """
-        Compares this crawl request to another one by priority.
-
-        :param other: the other crawl request
-        :return: True if this request's priority is larger, False otherwise
-        """
-
-        return self._priority > other._priority
-
     def __str__(self) -> str:
         """
         Returns the string representation of the crawl request.
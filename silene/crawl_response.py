@@ -19,6 +19,8 @@ if TYPE_CHECKING:
 class CrawlResponse:
     """Represents an HTTP response."""
 
+    __slots__ = ('_request', '_status', '_headers', '_text')
+
     def __init__(
             self,
             request: 'CrawlRequest',
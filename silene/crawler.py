@@ -20,10 +20,11 @@ from typing import Optional, List, Any
 
 import pyppeteer
 import syncer
-from pyppeteer.browser import Browser
-from pyppeteer.errors import PageError, ElementHandleError
+from pyppeteer.browser import Browser, BrowserContext
+from pyppeteer.errors import PageError, ElementHandleError, NetworkError
 from pyppeteer.network_manager import Request, Response
 from pyppeteer.page import Page
+from pyppeteer.target import Target
 
 from silene.browser_page import BrowserPage
 from silene.cookie import Cookie
@@ -33,7 +34,7 @@ from silene.crawl_response import CrawlResponse
 from silene.crawler_configuration import CrawlerConfiguration
 from silene.element import Element
 from silene.errors import NoSuchElementError, WaitTimeoutError, CrawlerNotRunningError, NoSuchPageError, \
-    NavigationTimeoutError
+    NavigationTimeoutError, PageWaitTimeoutError
 
 logger = logging.getLogger(__name__)
 
@@ -56,10 +57,10 @@ class Crawler(ABC):
         self._running: bool = False
         self._stop_initiated: bool = False
         self._browser: Optional[Browser] = None
+        self._browser_context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
         self._page_index: Optional[int] = None
         self._next_request: Optional[CrawlRequest] = None
-        self._send_head_request: bool = False
         self._aborted_request: bool = False
         self._last_request: Optional[Request] = None
         self._last_response: Optional[Response] = None
@@ -82,19 +83,38 @@ class Crawler(ABC):
         """
 
         self._running = True
-        self._browser = syncer.sync(pyppeteer.launch())
-        self._page = syncer.sync(self._browser.pages())[0]  # about:blank page
-        self._page_index = 0
-        self._add_page_listeners(self._page)
-
-        self.on_start()
-        self._run()
-        self.on_stop()
-
-        syncer.sync(self._page.close())
-        syncer.sync(self._browser.close())
-        self._running = False
-        self._stop_initiated = False
+        try:
+            if self._configuration.browser_ws_endpoint:
+                # Work in a separate incognito context, so that pages and cookies are not shared with other clients
+                self._browser = syncer.sync(pyppeteer.connect(
+                    browserWSEndpoint=self._configuration.browser_ws_endpoint))
+                self._browser_context = syncer.sync(self._browser.createIncognitoBrowserContext())
+                self._page = syncer.sync(self._browser_context.newPage())
+            else:
+                self._browser = syncer.sync(pyppeteer.launch())
+                self._browser_context = self._browser.browserContexts[0]  # default context
+                self._page = syncer.sync(self._browser_context.pages())[0]  # about:blank page
+            self._page_index = 0
+            self._add_page_listeners(self._page)
+
+            self.on_start()
+            self._run()
+            self.on_stop()
+        except Exception:
+            # Release the browser even if a callback raised, a shared browser would otherwise keep the context open
+            try:
+                self._close_browser()
+            except Exception:
+                # Do not replace the original exception with the teardown error
+                logger.exception('Failed to close the browser')
+            raise
+        finally:
+            try:
+                # Does nothing if the browser has already been released above
+                self._close_browser()
+            finally:
+                self._running = False
+                self._stop_initiated = False
 
     def crawl(self, request: CrawlRequest) -> bool:
         """
@@ -160,7 +180,7 @@ class Crawler(ABC):
 
         self._check_if_crawler_running()
 
-        pages = syncer.sync(self._browser.pages())
+        pages = syncer.sync(self._browser_context.pages())
         if len(pages) == 1:
             raise ValueError('Cannot close the last page')
 
@@ -256,10 +276,11 @@ class Crawler(ABC):
 
         self._check_if_crawler_running()
 
-        return [
-            BrowserPage(index, page.url, syncer.sync(page.title()))
-            for index, page in enumerate(syncer.sync(self._browser.pages()))
-        ]
+        pages = syncer.sync(self._browser_context.pages())
+        # Fetch the titles concurrently instead of waiting for each page one after another
+        titles = syncer.sync(asyncio.gather(*(page.title() for page in pages)))
+
+        return [BrowserPage(index, page.url, title) for index, (page, title) in enumerate(zip(pages, titles))]
 
     def get_title(self) -> str:
         """
@@ -331,7 +352,7 @@ class Crawler(ABC):
         self._check_if_crawler_running()
 
         try:
-            self._page = syncer.sync(self._browser.pages())[page.index]
+            self._page = syncer.sync(self._browser_context.pages())[page.index]
         except IndexError:
             raise NoSuchPageError(page.index)
 
@@ -388,6 +409,25 @@ class Crawler(ABC):
         except pyppeteer.errors.TimeoutError:
             raise WaitTimeoutError(timeout, selector)
 
+    def wait_for_pages(self, count: int, timeout: int = 30000) -> None:
+        """
+        Waits until the specified number of pages are open in the browser and the pages opened in the meantime have
+        loaded.
+        Note: A new page counts as loaded once it has navigated away from about:blank and its document has loaded.
+
+        :param count: the number of pages to wait for
+        :param timeout: maximum time to wait for (in milliseconds), 0 disables the timeout, defaults to 30000
+        :raise PageWaitTimeoutError: if the timeout is exceeded
+        """
+
+        self._check_if_crawler_running()
+
+        try:
+            # 0 means no timeout, as in the other wait methods
+            syncer.sync(asyncio.wait_for(self._wait_for_page_count(count), timeout / 1000 if timeout else None))
+        except asyncio.TimeoutError:
+            raise PageWaitTimeoutError(timeout, count)
+
     def wait_for_timeout(self, milliseconds: int) -> None:
         """
         Waits for timeout.
@@ -436,15 +476,90 @@ class Crawler(ABC):
         if not self._running:
             raise CrawlerNotRunningError()
 
+    def _close_browser(self) -> None:
+        if self._browser is None:
+            return
+
+        try:
+            if self._configuration.browser_ws_endpoint:
+                # Leave the browser running for other clients
+                try:
+                    if self._browser_context is not None:
+                        syncer.sync(self._browser_context.close())
+                finally:
+                    syncer.sync(self._browser.disconnect())
+            else:
+                try:
+                    if self._page is not None:
+                        syncer.sync(self._page.close())
+                finally:
+                    syncer.sync(self._browser.close())
+        finally:
+            self._browser = None
+            self._browser_context = None
+            self._page = None
+
+    async def _wait_for_page_count(self, count: int) -> None:
+        opened_targets = []
+        target_created = asyncio.Event()
+
+        def on_target_created(target: Target) -> None:
+            if target.type == 'page':
+                opened_targets.append(target)
+            target_created.set()
+
+        self._browser_context.on(BrowserContext.Events.TargetCreated, on_target_created)
+        try:
+            while True:
+                # Clear before counting, so that a page opened in between is not missed
+                target_created.clear()
+                if len(await self._browser_context.pages()) >= count:
+                    break
+                await target_created.wait()
+        finally:
+            self._browser_context.remove_listener(BrowserContext.Events.TargetCreated, on_target_created)
+
+        # Pages that were already open are not waited for, a slow one would block the call
+        open_targets = self._browser_context.targets()
+        pages = await asyncio.gather(*(target.page() for target in opened_targets if target in open_targets))
+        await asyncio.gather(*(self._wait_for_page_load(page) for page in pages if page is not None))
+
+    @staticmethod
+    async def _wait_for_page_load(page: Page) -> None:
+        changed = asyncio.Event()
+
+        def on_change(*_) -> None:
+            changed.set()
+
+        page_events = (Page.Events.FrameNavigated, Page.Events.Load, Page.Events.Close)
+        for event in page_events:
+            page.on(event, on_change)
+        try:
+            while not page.isClosed():
+                # Clear before checking, so that a change in between is not missed
+                changed.clear()
+                try:
+                    # A new page starts on an already loaded about:blank document, and its target can still report
+                    # about:blank after it has been created, so only the location of the document itself is trusted
+                    href, ready_state = await page.evaluate('() => [location.href, document.readyState]')
+                    if href != 'about:blank' and ready_state == 'complete':
+                        return
+                except NetworkError:
+                    # The execution context was destroyed by a navigation
+                    pass
+                await changed.wait()
+        finally:
+            for event in page_events:
+                page.remove_listener(event, on_change)
+
     def _run(self) -> None:
         while not self._stop_initiated and self._crawl_frontier.has_next_request():
             self._aborted_request = False
             self._next_request = self._crawl_frontier.get_next_request()
 
-            # Send a HEAD request first
-            self._send_head_request = True
+            # Redirects are detected by aborting the redirected navigation request, so a single GET request is enough
             try:
-                syncer.sync(self._page.goto(self._next_request.url))
+                response = syncer.sync(self._page.goto(self._next_request.url))
             except PageError as error:
                 # Ignore exceptions that are caused by aborted requests
                 if self._aborted_request:
@@ -454,9 +569,7 @@ class Crawler(ABC):
                 else:
                     raise error
 
-            # Send a GET request
-            self._send_head_request = False
-            self._handle_response(self._next_request, syncer.sync(self._page.goto(self._next_request.url)))
+            self._handle_response(self._next_request, response)
 
     def _add_page_listeners(self, page: Page) -> None:
         syncer.sync(self._page.setRequestInterception(True))
@@ -468,17 +581,16 @@ class Crawler(ABC):
 
         if request.isNavigationRequest() and len(request.redirectChain) > 0:
             self._aborted_request = True
-            await request.abort()
+            # Chrome commits an error page for failed navigations, which can finish loading during the next navigation
+            # and end it early, but it keeps the current document when the navigation is aborted
+            await request.abort('aborted')
         else:
             overrides = {}
 
-            if self._send_head_request:
-                overrides['method'] = 'HEAD'
-
-            if request.headers:
-                headers = request.headers.copy()
-                headers.update(self._next_request.headers)
-                overrides['headers'] = headers
+            # Each request carries its own browser headers, so the merged headers cannot be reused across requests,
+            # but the merge can be skipped entirely when the crawl request has no custom headers
+            if request.headers and self._next_request.headers:
+                overrides['headers'] = {**request.headers, **self._next_request.headers}
 
             await request.continue_(overrides)
 
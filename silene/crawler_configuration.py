@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import List
+from functools import lru_cache
+from typing import List, Optional
 
 import tld
 from tld.exceptions import TldDomainNotFound
@@ -20,6 +21,15 @@ from tld.exceptions import TldDomainNotFound
 from silene.crawl_request import CrawlRequest
 
 
+@lru_cache(maxsize=1024)
+def _extract_domain(domain: str) -> str:
+    # Configurations often share the same allowed domains, so the results of the TLD lookup are memoized
+    try:
+        return tld.get_tld(domain, as_object=True, fix_protocol=True).parsed_url.hostname
+    except TldDomainNotFound:
+        raise ValueError(f'Could not extract a valid domain from {domain}')
+
+
 class CrawlerConfiguration:
     """Specifies settings of the crawler."""
 
@@ -28,7 +38,8 @@ class CrawlerConfiguration:
             seed_requests: List[CrawlRequest],
             filter_duplicate_requests: bool = True,
             filter_offsite_requests: bool = False,
-            allowed_domains: List[str] = None
+            allowed_domains: List[str] = None,
+            browser_ws_endpoint: str = None
     ) -> None:
         """
         Creates a new crawler configuration instance.
@@ -37,19 +48,15 @@ class CrawlerConfiguration:
         :param filter_duplicate_requests: toggles duplicate request filtering, defaults to True (optional)
         :param filter_offsite_requests: toggles offsite request filtering, defaults to False (optional)
         :param allowed_domains: the list of allowed domains (optional)
+        :param browser_ws_endpoint: the WebSocket endpoint of a running browser to connect to instead of launching a
+                                    new one (optional)
         """
 
         self._seed_requests = seed_requests
         self._filter_duplicate_requests = filter_duplicate_requests
         self._filter_offsite_requests = filter_offsite_requests
-        self._allowed_domains = []
-        if allowed_domains:
-            for domain in allowed_domains:
-                try:
-                    result = tld.get_tld(domain, as_object=True, fix_protocol=True)
-                    self._allowed_domains.append(result.parsed_url.hostname)
-                except TldDomainNotFound:
-                    raise ValueError(f'Could not extract a valid domain from {domain}')
+        self._browser_ws_endpoint = browser_ws_endpoint
+        self._allowed_domains = [_extract_domain(domain) for domain in allowed_domains] if allowed_domains else []
 
     @property
     def seed_requests(self) -> List[CrawlRequest]:
@@ -92,6 +99,16 @@ class CrawlerConfiguration:
 
         return self._allowed_domains
 
+    @property
+    def browser_ws_endpoint(self) -> Optional[str]:
+        """
+        Returns the WebSocket endpoint of the browser to connect to.
+
+        :return: the WebSocket endpoint of the browser to connect to, None if a new browser is launched
+        """
+
+        return self._browser_ws_endpoint
+
     def __str__(self):
         """
         Returns the string representation of the crawler configuration.
@@ -102,4 +119,5 @@ class CrawlerConfiguration:
         return f'CrawlerConfiguration(seed_requests={len(self._seed_requests)} requests, ' \
                f'filter_duplicate_requests={self._filter_duplicate_requests}, ' \
                f'filter_offsite_requests={self._filter_offsite_requests}, ' \
-               f'allowed_domains={len(self._allowed_domains)} domains)'
+               f'allowed_domains={len(self._allowed_domains)} domains, ' \
+               f'browser_ws_endpoint={self._browser_ws_endpoint})'
@@ -178,3 +178,37 @@ class NavigationTimeoutError(SileneError):
         """
 
         return self._message
+
+
+class PageWaitTimeoutError(SileneError):
+    """Error that is raised when a timeout occurs while waiting for pages to open."""
+
+    def __init__(self, timeout: int, count: int) -> None:
+        """
+        Creates a new instance of this class.
+
+        :param timeout: the timeout (in milliseconds)
+        :param count: the number of pages waited for
+        """
+
+        self._message = f'Timeout {timeout}ms exceeded waiting for {count} page{"s" if count != 1 else ""}'
+        super().__init__(self._message)
+
+    @property
+    def message(self) -> str:
+        """
+        Returns the error message.
+
+        :return: the error message
+        """
+
+        return self._message
+
+    def __str__(self) -> str:
+        """
+        Returns the string representation of the error.
+
+        :return: the string representation of the error
+        """
+
+        return self._message
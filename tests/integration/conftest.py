@@ -0,0 +1,75 @@
+# Copyright 2020 Peter Bencze
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import threading
+from typing import Iterator, Optional, Tuple
+
+import pyppeteer
+import pytest
+import syncer
+from pytest_httpserver import HTTPServer
+from pytest_httpserver.httpserver import HTTPServerError
+from pytest_httpserver.pytest_plugin import get_httpserver_listen_address
+from werkzeug.serving import make_server, WSGIRequestHandler
+
+
+class _KeepAliveRequestHandler(WSGIRequestHandler):
+    # Answers with HTTP/1.1, so the browser can reuse its connections across requests (responses without a
+    # Content-Length header still close the connection)
+    protocol_version = 'HTTP/1.1'
+
+
+class _ThreadedHTTPServer(HTTPServer):
+    def start(self) -> None:
+        # Same as HTTPServer.start, except that each connection is served in its own thread, so a slow handler does not
+        # block the other requests of the browser. This copies the method body and relies on the server and
+        # thread_target attributes of pytest-httpserver 0.3.6, so it has to be revisited when that pin is upgraded.
+        if self.is_running():
+            raise HTTPServerError('Server is already running')
+
+        self.server = make_server(self.host, self.port, self.application, threaded=True,
+                                  request_handler=_KeepAliveRequestHandler, ssl_context=self.ssl_context)
+        self.port = self.server.port
+        self.server_thread = threading.Thread(target=self.thread_target)
+        self.server_thread.start()
+
+
+@pytest.fixture(scope='session')
+def httpserver_listen_address() -> Tuple[Optional[str], Optional[int]]:
+    # Session-scoped version of the plugin fixture, so that PYTEST_HTTPSERVER_HOST and PYTEST_HTTPSERVER_PORT still
+    # apply to the shared server
+    return get_httpserver_listen_address()
+
+
+@pytest.fixture(scope='session')
+def threaded_httpserver(httpserver_listen_address: Tuple[Optional[str], Optional[int]]) -> Iterator[HTTPServer]:
+    host, port = httpserver_listen_address
+    server = _ThreadedHTTPServer(host=host or HTTPServer.DEFAULT_LISTEN_HOST,
+                                 port=port or HTTPServer.DEFAULT_LISTEN_PORT)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def httpserver(threaded_httpserver: HTTPServer) -> HTTPServer:
+    threaded_httpserver.clear()
+    return threaded_httpserver
+
+
+@pytest.fixture(scope='session')
+def browser_ws_endpoint() -> Iterator[str]:
+    browser = syncer.sync(pyppeteer.launch())
+    yield browser.wsEndpoint
+    syncer.sync(browser.close())
@@ -10,10 +10,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import threading
 import time
 import timeit
+from typing import Any, Callable, List, Optional
 
+import pyppeteer
 import pytest
+import syncer
 from pytest_httpserver import HTTPServer
 from werkzeug import Request, Response
 
@@ -23,1038 +27,935 @@ from silene.crawl_request import CrawlRequest
 from silene.crawl_response import CrawlResponse
 from silene.crawler import Crawler
 from silene.crawler_configuration import CrawlerConfiguration
-from silene.errors import NoSuchElementError, NoSuchPageError, NavigationTimeoutError, WaitTimeoutError
+from silene.errors import CrawlerNotRunningError, NoSuchElementError, NoSuchPageError, NavigationTimeoutError, \
+    WaitTimeoutError, PageWaitTimeoutError
+
+
+# Templates of pages that link to the second page, formatted with its URL
+_LINK_PAGE_HTML = '''
+    <title>First page</title>
+    <a id="link" href="{}">Go to second page</a>
+'''
+# The new tab is opened shortly after the click, so that it is opened while wait_for_pages is already waiting for it
+_NEW_TAB_LINK_PAGE_HTML = '''
+    <title>First page</title>
+    <a id="link" href="{}" onclick="setTimeout(() => window.open(this.href), 200); return false">Go to second page</a>
+'''
+# The new tab starts on about:blank and only navigates to the second page later, after its target has been created
+_DELAYED_NAVIGATION_NEW_TAB_LINK_PAGE_HTML = '''
+    <title>First page</title>
+    <a id="link" href="{}" onclick="setTimeout(() => {{
+        const tab = window.open();
+        setTimeout(() => tab.location.href = this.href, 500);
+    }}, 200); return false">Go to second page</a>
+'''
+_SECOND_PAGE_HTML = b'<title>Second page</title>'
+_TEST_ELEMENT_HTML = b'<div id="test">Test</div>'
+_INPUT_HTML = b'<input type="text" id="test">'
+_DOUBLE_CLICK_HTML = b'''
+    <button id="button" ondblclick="onDoubleClick()">Test button</div>
+
+    <script>
+        function onDoubleClick() {
+            document.getElementById("button").textContent = "Double clicked!";
+        }
+    </script>
+'''
+_SELECT_HTML = b'''
+    <select id="test" multiple>
+        <option value="foo">foo</option>
+        <option value="bar">bar</option>
+        <option value="baz">baz</option>
+    </select>
+'''
+_DELAYED_ELEMENT_HTML = b'''
+    <script>
+        setTimeout(function() {
+            var element = document.createElement("div");
+            element.id = "test";
+            document.body.appendChild(element);
+        }, 500);
+    </script>
+'''
+
+
+class _MockCrawler(Crawler):
+    def __init__(
+            self,
+            seed_requests: List[CrawlRequest],
+            browser_ws_endpoint: Optional[str],
+            on_start: Callable[[Crawler], None] = None,
+            on_request_redirect: Callable[[Crawler, CrawlResponse, CrawlRequest], None] = None,
+            on_response_success: Callable[[Crawler, CrawlResponse], None] = None,
+            on_response_error: Callable[[Crawler, CrawlResponse], None] = None,
+            on_stop: Callable[[Crawler], None] = None
+    ) -> None:
+        self._seed_requests = seed_requests
+        self._browser_ws_endpoint = browser_ws_endpoint
+        self._start_callback = on_start
+        self._redirect_callback = on_request_redirect
+        self._success_callback = on_response_success
+        self._error_callback = on_response_error
+        self._stop_callback = on_stop
+
+        super().__init__()
+
+    def configure(self) -> CrawlerConfiguration:
+        return CrawlerConfiguration(self._seed_requests, browser_ws_endpoint=self._browser_ws_endpoint)
+
+    def on_start(self) -> None:
+        if self._start_callback:
+            self._start_callback(self)
+
+    def on_request_redirect(self, response: CrawlResponse, redirected_request: CrawlRequest) -> None:
+        if self._redirect_callback:
+            self._redirect_callback(self, response, redirected_request)
+
+    def on_response_success(self, response: CrawlResponse) -> None:
+        if self._success_callback:
+            self._success_callback(self, response)
+
+    def on_response_error(self, response: CrawlResponse) -> None:
+        if self._error_callback:
+            self._error_callback(self, response)
+        else:
+            pytest.fail(f'Response error: {response}')
+
+    def on_stop(self) -> None:
+        if self._stop_callback:
+            self._stop_callback(self)
+
+
+def test_stop_should_stop_crawler_before_processing_next_request(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
+    first_page_path = '/first-page'
+    second_page_path = '/second-page'
+    first_page_url = httpserver.url_for(first_page_path)
+    second_page_url = httpserver.url_for(second_page_path)
+    httpserver.expect_oneshot_request(first_page_path, method='GET').respond_with_data()
+    response_count = 0
+
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        nonlocal response_count
+        response_count += 1
+        crawler.stop()
+
+    _MockCrawler([CrawlRequest(first_page_url), CrawlRequest(second_page_url)], browser_ws_endpoint,
+                 on_response_success=on_response_success).start()
+
+    assert response_count == 1
+    httpserver.check_assertions()
 
 
-def test_stop_should_stop_crawler_before_processing_next_request(httpserver: HTTPServer) -> None:
+def test_start_should_launch_browser_when_browser_ws_endpoint_is_not_specified(httpserver: HTTPServer) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(first_page_path, method='GET').respond_with_data()
+    first_page_response_data = _NEW_TAB_LINK_PAGE_HTML.format(second_page_url)
+    httpserver.expect_ordered_request(first_page_path,
+                                      method='GET').respond_with_data(content_type='text/html',
+                                                                      response_data=first_page_response_data)
+    httpserver.expect_ordered_request(second_page_path,
+                                      method='GET').respond_with_data(content_type='text/html',
+                                                                      response_data=_SECOND_PAGE_HTML)
+    stopped = False
+
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
+        crawler.wait_for_pages(2)
+        pages = crawler.get_pages()
+
+        assert [(page.url, page.title) for page in pages] == [(first_page_url, 'First page'),
+                                                             (second_page_url, 'Second page')]
+
+        crawler.switch_to_page(pages[1])
+
+        assert crawler.get_current_page().title == 'Second page'
 
-    class TestCrawler(Crawler):
-        response_count = 0
+        crawler.switch_to_page(pages[0])
+        crawler.close_page(pages[1])
 
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url), CrawlRequest(second_page_url)])
+        assert len(crawler.get_pages()) == 1
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            self.response_count += 1
-            self.stop()
+        crawler.stop()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+    def on_stop(crawler: Crawler) -> None:
+        nonlocal stopped
+        stopped = True
 
-    crawler = TestCrawler()
+    crawler = _MockCrawler([CrawlRequest(first_page_url)], None, on_response_success=on_response_success,
+                           on_stop=on_stop)
     crawler.start()
 
-    assert crawler.response_count == 1
+    assert stopped
+
+    with pytest.raises(CrawlerNotRunningError):
+        crawler.get_pages()
+
     httpserver.check_assertions()
 
 
-def test_successful_request_handing(httpserver: HTTPServer) -> None:
-    request_path = '/response-success'
+def test_start_should_close_browser_context_when_callback_raises_error(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
+    request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = 'Test'
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(response_data=response_data)
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        raise RuntimeError('Test')
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert response.request.url == request_url
-            assert response.status == 200
-            assert len(response.headers) > 0
-            assert response.text == response_data
+    crawler = _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success)
+    with pytest.raises(RuntimeError, match=r'^Test$'):
+        crawler.start()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+    with pytest.raises(CrawlerNotRunningError):
+        crawler.get_url()
 
-    TestCrawler().start()
+    browser = syncer.sync(pyppeteer.connect(browserWSEndpoint=browser_ws_endpoint))
+    try:
+        assert len(browser.browserContexts) == 1  # default context only
+    finally:
+        syncer.sync(browser.disconnect())
 
     httpserver.check_assertions()
 
 
-def test_request_redirect_handling(httpserver: HTTPServer) -> None:
+def test_start_should_raise_callback_error_when_closing_browser_fails(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
+    first_page_path = '/first-page'
+    second_page_path = '/second-page'
+    httpserver.expect_ordered_request(first_page_path, method='GET').respond_with_data()
+    httpserver.expect_ordered_request(second_page_path, method='GET').respond_with_data()
+    visited_urls = []
+
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        visited_urls.append(response.request.url)
+        if len(visited_urls) > 1:
+            return
+
+        # Close the context of the crawler behind its back, so that closing it again during the teardown fails
+        browser = syncer.sync(pyppeteer.connect(browserWSEndpoint=browser_ws_endpoint))
+        try:
+            for browser_context in browser.browserContexts:
+                if browser_context.isIncognito():
+                    syncer.sync(browser_context.close())
+        finally:
+            syncer.sync(browser.disconnect())
+
+        raise RuntimeError('Test')
+
+    crawler = _MockCrawler([CrawlRequest(httpserver.url_for(first_page_path))], browser_ws_endpoint,
+                           on_response_success=on_response_success)
+    with pytest.raises(RuntimeError, match=r'^Test$'):
+        crawler.start()
+
+    with pytest.raises(CrawlerNotRunningError):
+        crawler.get_url()
+
+    # The crawler can connect again, so the previous connection was released
+    crawler.crawl(CrawlRequest(httpserver.url_for(second_page_path)))
+    crawler.start()
+
+    assert visited_urls == [httpserver.url_for(first_page_path), httpserver.url_for(second_page_path)]
+
+    httpserver.check_assertions()
+
+
+def test_successful_request_handing(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
+    request_path = '/response-success'
+    request_url = httpserver.url_for(request_path)
+    response_data = 'Test'
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(response_data=response_data)
+
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        assert response.request.url == request_url
+        assert response.status == 200
+        assert len(response.headers) > 0
+        assert response.text == response_data
+
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
+
+    httpserver.check_assertions()
+
+
+def test_request_redirect_handling(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     redirect_origin_path = '/redirect-origin'
     redirect_target_path = '/redirect-target'
     redirect_origin_url = httpserver.url_for(redirect_origin_path)
     redirect_target_url = httpserver.url_for(redirect_target_path)
     headers = {'Location': redirect_target_url}
-    httpserver.expect_ordered_request(redirect_origin_path, method='HEAD').respond_with_data(status=301,
-                                                                                             headers=headers)
-    httpserver.expect_ordered_request(redirect_target_path, method='HEAD').respond_with_data()
+    httpserver.expect_ordered_request(redirect_origin_path, method='GET').respond_with_data(status=301,
+                                                                                            headers=headers)
     httpserver.expect_ordered_request(redirect_target_path, method='GET').respond_with_data()
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(redirect_origin_url)])
-
-        def on_request_redirect(self, response: CrawlResponse, redirected_request: CrawlRequest) -> None:
-            assert response.request.url == redirect_origin_url
-            assert redirected_request.url == redirect_target_url
-            assert response.status == 301
-            assert len(response.headers) > 0
-            assert response.text is None
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert response.request.url == redirect_target_url
-            assert response.status == 200
-            assert len(response.headers) > 0
-            assert response.text == ''
+    def on_request_redirect(crawler: Crawler, response: CrawlResponse, redirected_request: CrawlRequest) -> None:
+        assert response.request.url == redirect_origin_url
+        assert redirected_request.url == redirect_target_url
+        assert response.status == 301
+        assert len(response.headers) > 0
+        assert response.text is None
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        assert response.request.url == redirect_target_url
+        assert response.status == 200
+        assert len(response.headers) > 0
+        assert response.text == ''
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(redirect_origin_url)], browser_ws_endpoint,
+                 on_request_redirect=on_request_redirect, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_request_error_handling(httpserver: HTTPServer) -> None:
+def test_request_error_handling(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/response-error'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(status=500)
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(status=500)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        pytest.fail(f'Response success: {response}')
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert False, f'Response success: {response}'
+    def on_response_error(crawler: Crawler, response: CrawlResponse) -> None:
+        assert response.request.url == request_url
+        assert response.status == 500
+        assert len(response.headers) > 0
+        assert response.text == ''
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert response.request.url == request_url
-            assert response.status == 500
-            assert len(response.headers) > 0
-            assert response.text == ''
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success,
+                 on_response_error=on_response_error).start()
 
     httpserver.check_assertions()
 
 
-def test_custom_request_header_handling(httpserver: HTTPServer) -> None:
+def test_custom_request_header_handling(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD', headers={'foo': 'bar'}).respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET', headers={'foo': 'bar'}).respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url, headers={'foo': 'bar'})])
+    httpserver.expect_oneshot_request(request_path, method='GET', headers={'foo': 'bar'}).respond_with_data()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url, headers={'foo': 'bar'})], browser_ws_endpoint).start()
 
     httpserver.check_assertions()
 
 
-def test_on_start_should_be_called_when_crawler_starts() -> None:
+def test_on_start_should_be_called_when_crawler_starts(browser_ws_endpoint: str) -> None:
     called = False
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([])
-
-        def on_start(self) -> None:
-            nonlocal called
-            called = True
+    def on_start(crawler: Crawler) -> None:
+        nonlocal called
+        called = True
 
-    TestCrawler().start()
+    _MockCrawler([], browser_ws_endpoint, on_start=on_start).start()
 
     assert called is True
 
 
-def test_on_stop_should_be_called_when_crawler_stops() -> None:
+def test_on_stop_should_be_called_when_crawler_stops(browser_ws_endpoint: str) -> None:
     called = False
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([])
-
-        def on_stop(self) -> None:
-            nonlocal called
-            called = True
+    def on_stop(crawler: Crawler) -> None:
+        nonlocal called
+        called = True
 
-    TestCrawler().start()
+    _MockCrawler([], browser_ws_endpoint, on_stop=on_stop).start()
 
     assert called is True
 
 
-def test_crawl_should_add_request_to_queue(httpserver: HTTPServer) -> None:
+def test_crawl_should_add_request_to_queue(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
     httpserver.expect_ordered_request(first_page_path, method='GET').respond_with_data()
-    httpserver.expect_ordered_request(second_page_path, method='HEAD').respond_with_data()
     httpserver.expect_ordered_request(second_page_path, method='GET').respond_with_data()
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url, success_func=self.on_first_response)])
+    def on_first_response(_: CrawlResponse) -> None:
+        assert crawler.crawl(CrawlRequest(second_page_url)) is True
 
-        def on_first_response(self, _: CrawlResponse) -> None:
-            assert self.crawl(CrawlRequest(second_page_url)) is True
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    crawler = _MockCrawler([CrawlRequest(first_page_url, success_func=on_first_response)], browser_ws_endpoint)
+    crawler.start()
 
     httpserver.check_assertions()
 
 
-def test_click_should_click_element_when_element_is_found(httpserver: HTTPServer) -> None:
+def test_click_should_click_element_when_element_is_found(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    response_data = f'<a id="link" href="{second_page_url}">Click me</a>'
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
+    response_data = _LINK_PAGE_HTML.format(second_page_url)
     httpserver.expect_ordered_request(first_page_path, method='GET').respond_with_data(content_type='text/html',
                                                                                        response_data=response_data)
     httpserver.expect_ordered_request(second_page_path, method='GET').respond_with_data()
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            self.click('#link')
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_click_should_raise_no_such_element_error_when_element_is_not_found(httpserver: HTTPServer) -> None:
+@pytest.mark.parametrize('interact', [
+    pytest.param(lambda crawler: crawler.click('#nonexistent'), id='click'),
+    pytest.param(lambda crawler: crawler.click_and_wait('#nonexistent', timeout=1000), id='click_and_wait'),
+    pytest.param(lambda crawler: crawler.double_click('#nonexistent'), id='double_click'),
+    pytest.param(lambda crawler: crawler.evaluate('#nonexistent', 'element => element.textContent'), id='evaluate'),
+    pytest.param(lambda crawler: crawler.select('#nonexistent', ['foo', 'bar']), id='select'),
+    pytest.param(lambda crawler: crawler.type('#nonexistent', 'Test'), id='type')
+])
+def test_element_interaction_should_raise_no_such_element_error_when_element_is_not_found(
+        httpserver: HTTPServer, browser_ws_endpoint: str, interact: Callable[[Crawler], Any]) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NoSuchElementError) as exc_info:
-                self.click('#nonexistent')
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        with pytest.raises(NoSuchElementError, match=r'^Unable to locate element using selector #nonexistent$'):
+            interact(crawler)
 
-            assert str(exc_info.value) == 'Unable to locate element using selector #nonexistent'
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
 def test_click_and_wait_should_click_element_and_wait_for_navigation_when_element_exists(
-        httpserver: HTTPServer) -> None:
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    first_page_response_data = f'''
-            <title>First page</title>
-            <a id="link" href="{second_page_url}">Go to second page</a>
-        '''
-    second_page_response_data = f'<title>Second page</title>'
+    first_page_response_data = _LINK_PAGE_HTML.format(second_page_url)
 
     def handle_request(_: Request) -> Response:
-        time.sleep(0.5)
-        return Response(second_page_response_data, 200, None, None, 'text/html')
+        time.sleep(0.1)
+        return Response(_SECOND_PAGE_HTML, 200, None, None, 'text/html')
 
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data(content_type='text/html')
     httpserver.expect_ordered_request(first_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
                                                                       response_data=first_page_response_data)
     httpserver.expect_ordered_request(second_page_path, method='GET').respond_with_handler(handle_request)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            self.click_and_wait('#link', timeout=1000)
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click_and_wait('#link', timeout=1000)
 
-            assert self.get_url() == second_page_url
+        assert crawler.get_url() == second_page_url
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_click_and_wait_should_raise_no_such_element_error_when_element_does_not_exist(httpserver: HTTPServer) -> None:
+def test_click_and_wait_should_raise_navigation_timeout_error_when_timeout_is_exceeded(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    first_page_response_data = f'''
-            <title>First page</title>
-            <a id="link" href="{second_page_url}">Go to second page</a>
-        '''
-
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(first_page_path,
-                                      method='GET').respond_with_data(content_type='text/html',
-                                                                      response_data=first_page_response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url)])
+    first_page_response_data = _LINK_PAGE_HTML.format(second_page_url)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NoSuchElementError) as exc_info:
-                self.click_and_wait('#nonexistent', timeout=1000)
-
-            assert str(exc_info.value) == 'Unable to locate element using selector #nonexistent'
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
-
-    httpserver.check_assertions()
-
-
-def test_click_and_wait_should_raise_navigation_timeout_error_when_timeout_is_exceeded(httpserver: HTTPServer) -> None:
-    first_page_path = '/first-page'
-    second_page_path = '/second-page'
-    first_page_url = httpserver.url_for(first_page_path)
-    second_page_url = httpserver.url_for(second_page_path)
-    first_page_response_data = f'''
-            <title>First page</title>
-            <a id="link" href="{second_page_url}">Go to second page</a>
-        '''
-    second_page_response_data = f'<title>Second page</title>'
+    response_released = threading.Event()
 
     def handle_request(_: Request) -> Response:
-        time.sleep(0.5)
-        return Response(second_page_response_data, 200, None, None, 'text/html')
+        # Hold back the response until the timeout is observed, so that the navigation cannot finish in time
+        response_released.wait(timeout=1)
+        return Response(_SECOND_PAGE_HTML, 200, None, None, 'text/html')
 
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data(content_type='text/html')
     httpserver.expect_ordered_request(first_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
                                                                       response_data=first_page_response_data)
     httpserver.expect_ordered_request(second_page_path, method='GET').respond_with_handler(handle_request)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        with pytest.raises(NavigationTimeoutError, match=r'^Timeout 1ms exceeded waiting for navigation$'):
+            crawler.click_and_wait('#link', timeout=1)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NavigationTimeoutError) as exc_info:
-                self.click_and_wait('#link', timeout=1)
+        response_released.set()
 
-            assert str(exc_info.value) == 'Timeout 1ms exceeded waiting for navigation'
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_close_page_should_raise_value_error_when_there_is_only_one_page(httpserver: HTTPServer) -> None:
+def test_close_page_should_raise_value_error_when_there_is_only_one_page(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            page = self.get_current_page()
-
-            with pytest.raises(ValueError) as exc_info:
-                self.close_page(page)
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-            assert str(exc_info.value) == 'Cannot close the last page'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        page = crawler.get_current_page()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+        with pytest.raises(ValueError, match=r'^Cannot close the last page$'):
+            crawler.close_page(page)
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_close_page_should_close_specific_page_when_there_are_multiple_pages(httpserver: HTTPServer) -> None:
+def test_close_page_should_close_specific_page_when_there_are_multiple_pages(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    first_page_response_data = f'''
-        <title>First page</title>
-        <a id="link" href="{second_page_url}" target="_blank">Go to second page</a>
-    '''
-    second_page_response_data = f'<title>Second page</title>'
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
+    first_page_response_data = _NEW_TAB_LINK_PAGE_HTML.format(second_page_url)
     httpserver.expect_ordered_request(first_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
                                                                       response_data=first_page_response_data)
     httpserver.expect_ordered_request(second_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
-                                                                      response_data=second_page_response_data)
+                                                                      response_data=_SECOND_PAGE_HTML)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
+        crawler.wait_for_pages(2)
+        pages = crawler.get_pages()
+        crawler.close_page(pages[1])
+        pages = crawler.get_pages()
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            self.click('#link')
-            self.wait_for_timeout(500)
-            pages = self.get_pages()
-            self.close_page(pages[1])
-            pages = self.get_pages()
+        assert len(pages) == 1
+        assert pages[0].index == 0
+        assert pages[0].url == first_page_url
+        assert pages[0].title == 'First page'
 
-            assert len(pages) == 1
-            assert pages[0].index == 0
-            assert pages[0].url == first_page_url
-            assert pages[0].title == 'First page'
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_delete_cookie_should_delete_cookie(httpserver: HTTPServer) -> None:
+def test_delete_cookie_should_delete_cookie(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
-    third_page_path = '/third-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    third_page_url = httpserver.url_for(third_page_path)
     cookie = Cookie('cookie_name', 'cookie_value')
     headers = {'Cookie': 'cookie_name=cookie_value'}
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
     httpserver.expect_ordered_request(first_page_path, method='GET').respond_with_data()
-    httpserver.expect_ordered_request(second_page_path, method='HEAD', headers=headers).respond_with_data()
     httpserver.expect_ordered_request(second_page_path, method='GET', headers=headers).respond_with_data()
-    httpserver.expect_ordered_request(third_page_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(third_page_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([
-                CrawlRequest(first_page_url, success_func=self.on_first_page_response),
-                CrawlRequest(second_page_url, success_func=self.on_second_page_response),
-                CrawlRequest(third_page_url, success_func=self.on_third_page_response)
-            ])
 
-        def on_first_page_response(self, _: CrawlResponse) -> None:
-            self.set_cookie(cookie)
+    def on_first_page_response(_: CrawlResponse) -> None:
+        crawler.set_cookie(cookie)
 
-        def on_second_page_response(self, _: CrawlResponse) -> None:
-            assert len(self.get_cookies()) == 1
+    def on_second_page_response(_: CrawlResponse) -> None:
+        assert len(crawler.get_cookies()) == 1
 
-            self.delete_cookie(cookie)
+        crawler.delete_cookie(cookie)
 
-        def on_third_page_response(self, _: CrawlResponse) -> None:
-            assert len(self.get_cookies()) == 0
+        assert len(crawler.get_cookies()) == 0
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    seed_requests = [
+        CrawlRequest(first_page_url, success_func=on_first_page_response),
+        CrawlRequest(second_page_url, success_func=on_second_page_response)
+    ]
+    crawler = _MockCrawler(seed_requests, browser_ws_endpoint)
+    crawler.start()
 
     httpserver.check_assertions()
 
 
-def test_double_click_should_double_click_element_when_element_exists(httpserver: HTTPServer) -> None:
+def test_double_click_should_double_click_element_when_element_exists(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = '''
-        <button id="button" ondblclick="onDoubleClick()">Test button</div>
-        
-        <script>
-            function onDoubleClick() {
-                document.getElementById("button").textContent = "Double clicked!";
-            }
-        </script>
-    '''
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=_DOUBLE_CLICK_HTML)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.double_click('#button')
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            self.double_click('#button')
+        assert crawler.find_element('#button').get_text() == 'Double clicked!'
 
-            assert self.find_element('#button').get_text() == 'Double clicked!'
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_double_click_should_raise_no_such_element_error_when_element_does_not_exist(httpserver: HTTPServer) -> None:
+def test_evaluate_should_evaluate_function_when_element_is_found(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = '<button id="button">Test button</div>'
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NoSuchElementError) as exc_info:
-                self.double_click('#nonexistent')
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=_TEST_ELEMENT_HTML)
 
-            assert str(exc_info.value) == 'Unable to locate element using selector #nonexistent'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        assert crawler.evaluate('#test', 'element => element.textContent') == 'Test'
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_evaluate_should_evaluate_function_when_element_is_found(httpserver: HTTPServer) -> None:
+def test_find_element_should_return_element_when_element_is_found(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = '<div id="test">Test</div>'
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=_TEST_ELEMENT_HTML)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert self.evaluate('#test', 'element => element.textContent') == 'Test'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        element = crawler.find_element('#test')
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+        assert element.get_attribute('id') == 'test'
+        assert element.get_text() == 'Test'
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_evaluate_should_raise_no_such_element_error_when_element_is_not_found(httpserver: HTTPServer) -> None:
+def test_find_element_should_return_none_when_element_is_not_found(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NoSuchElementError) as exc_info:
-                self.evaluate('#nonexistent', 'element => element.textContent')
-
-            assert str(exc_info.value) == 'Unable to locate element using selector #nonexistent'
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        assert crawler.find_element('#nonexistent') is None
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_find_element_should_return_element_when_element_is_found(httpserver: HTTPServer) -> None:
+def test_get_cookies_should_return_cookies_for_the_current_page(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = '<div id="test">Test</div>'
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            element = self.find_element('#test')
+    headers = {'Set-Cookie': 'cookie_name=cookie_value'}
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(headers=headers)
 
-            assert element.get_attribute('id') == 'test'
-            assert element.get_text() == 'Test'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        cookies = crawler.get_cookies()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+        assert len(cookies) == 1
+        assert cookies[0].name == 'cookie_name'
+        assert cookies[0].value == 'cookie_value'
+        assert cookies[0].domain == 'localhost'
+        assert cookies[0].path == '/'
+        assert cookies[0].expires == -1
+        assert cookies[0].http_only is False
+        assert cookies[0].secure is False
+        assert cookies[0].session is True
+        assert cookies[0].same_site is None
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_find_element_should_return_none_when_element_is_not_found(httpserver: HTTPServer) -> None:
+def test_get_current_page_should_return_current_open_page(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    response_data = '<title>Test</title>'
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=response_data)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert self.find_element('#nonexistent') is None
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        page = crawler.get_current_page()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+        assert page.index == 0
+        assert page.url == request_url
+        assert page.title == 'Test'
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_get_cookies_should_return_cookies_for_the_current_page(httpserver: HTTPServer) -> None:
+def test_get_title_should_return_current_page_title(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    headers = {'Set-Cookie': 'cookie_name=cookie_value'}
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(headers=headers)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            cookies = self.get_cookies()
-
-            assert len(cookies) == 1
-            assert cookies[0].name == 'cookie_name'
-            assert cookies[0].value == 'cookie_value'
-            assert cookies[0].domain == 'localhost'
-            assert cookies[0].path == '/'
-            assert cookies[0].expires == -1
-            assert cookies[0].http_only is False
-            assert cookies[0].secure is False
-            assert cookies[0].session is True
-            assert cookies[0].same_site is None
+    response_data = '<title>Test title</title>'
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=response_data)
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        assert crawler.get_title() == 'Test title'
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_get_current_page_should_return_current_open_page(httpserver: HTTPServer) -> None:
+def test_get_url_should_return_current_page_url(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = '<title>Test</title>'
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            page = self.get_current_page()
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-            assert page.index == 0
-            assert page.url == request_url
-            assert page.title == 'Test'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        assert crawler.get_url() == request_url
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_get_title_should_return_current_page_title(httpserver: HTTPServer) -> None:
-    request_path = '/page'
-    request_url = httpserver.url_for(request_path)
-    response_data = '<title>Test title</title>'
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+def test_get_pages_should_return_all_pages(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
+    first_page_path = '/first-page'
+    second_page_path = '/second-page'
+    first_page_url = httpserver.url_for(first_page_path)
+    second_page_url = httpserver.url_for(second_page_path)
+    first_page_response_data = _NEW_TAB_LINK_PAGE_HTML.format(second_page_url)
+    httpserver.expect_ordered_request(first_page_path,
+                                      method='GET').respond_with_data(content_type='text/html',
+                                                                      response_data=first_page_response_data)
+    httpserver.expect_ordered_request(second_page_path,
+                                      method='GET').respond_with_data(content_type='text/html',
+                                                                      response_data=_SECOND_PAGE_HTML)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert self.get_title() == 'Test title'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
+        crawler.wait_for_pages(2)
+        pages = crawler.get_pages()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+        assert len(pages) == 2
+        assert pages[0].index == 0
+        assert pages[0].url == first_page_url
+        assert pages[0].title == 'First page'
+        assert pages[1].index == 1
+        assert pages[1].url == second_page_url
+        assert pages[1].title == 'Second page'
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_get_url_should_return_current_page_url(httpserver: HTTPServer) -> None:
+def test_select_should_select_options_in_dropdown_list_when_element_is_found(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=_SELECT_HTML)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        values = ['foo', 'bar']
+        assert crawler.select('#test', values) == values
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert self.get_url() == request_url
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+    httpserver.check_assertions()
 
-    TestCrawler().start()
+
+def test_set_cookie_should_set_cookie(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
+    first_page_path = '/first-page'
+    second_page_path = '/second-page'
+    first_page_url = httpserver.url_for(first_page_path)
+    second_page_url = httpserver.url_for(second_page_path)
+    headers = {'Cookie': 'cookie_name=cookie_value'}
+    httpserver.expect_ordered_request(first_page_path, method='GET').respond_with_data()
+    httpserver.expect_ordered_request(second_page_path, method='GET', headers=headers).respond_with_data()
+
+    def on_first_page_response(_: CrawlResponse) -> None:
+        crawler.set_cookie(Cookie('cookie_name', 'cookie_value'))
+
+    seed_requests = [
+        CrawlRequest(first_page_url, success_func=on_first_page_response),
+        CrawlRequest(second_page_url)
+    ]
+    crawler = _MockCrawler(seed_requests, browser_ws_endpoint)
+    crawler.start()
 
     httpserver.check_assertions()
 
 
-def test_get_pages_should_return_all_pages(httpserver: HTTPServer) -> None:
+def test_switch_to_page_should_switch_to_specific_page_when_page_exists(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    first_page_response_data = f'''
-        <title>First page</title>
-        <a id="link" href="{second_page_url}" target="_blank">Go to second page</a>
-    '''
-    second_page_response_data = f'<title>Second page</title>'
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
+    first_page_response_data = _NEW_TAB_LINK_PAGE_HTML.format(second_page_url)
     httpserver.expect_ordered_request(first_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
                                                                       response_data=first_page_response_data)
     httpserver.expect_ordered_request(second_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
-                                                                      response_data=second_page_response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            self.click('#link')
-            self.wait_for_timeout(500)
-            pages = self.get_pages()
+                                                                      response_data=_SECOND_PAGE_HTML)
 
-            assert len(pages) == 2
-            assert pages[0].index == 0
-            assert pages[0].url == first_page_url
-            assert pages[0].title == 'First page'
-            assert pages[1].index == 1
-            assert pages[1].url == second_page_url
-            assert pages[1].title == 'Second page'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
+        crawler.wait_for_pages(2)
+        pages = crawler.get_pages()
+        crawler.switch_to_page(pages[1])
+        current_page = crawler.get_current_page()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+        assert current_page.index == 1
+        assert current_page.url == second_page_url
+        assert current_page.title == 'Second page'
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_select_should_select_options_in_dropdown_list_when_element_is_found(httpserver: HTTPServer) -> None:
+def test_switch_to_page_should_raise_no_such_page_error_when_page_does_not_exist(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = '''
-                    <select id="test" multiple>
-                        <option value="foo">foo</option>
-                        <option value="bar">bar</option>
-                        <option value="baz">baz</option>
-                    </select>
-    '''
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            values = ['foo', 'bar']
-            assert self.select('#test', values) == values
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        with pytest.raises(NoSuchPageError, match=r'^No page exists with index 1$'):
+            crawler.switch_to_page(BrowserPage(1, request_url, 'Nonexistent'))
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_select_should_raise_no_such_element_error_when_element_is_not_found(httpserver: HTTPServer) -> None:
+def test_type_should_type_value_in_input_element_when_element_is_found(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=_INPUT_HTML)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        value = 'Test'
+        crawler.type('#test', value)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NoSuchElementError) as exc_info:
-                self.select('#nonexistent', ['foo', 'bar'])
+        assert crawler.evaluate('#test', 'element => element.value') == value
 
-            assert str(exc_info.value) == 'Unable to locate element using selector #nonexistent'
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_set_cookie_should_set_cookie(httpserver: HTTPServer) -> None:
+def test_wait_for_pages_should_wait_until_pages_are_open(httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    headers = {'Cookie': 'cookie_name=cookie_value'}
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(first_page_path, method='GET').respond_with_data()
-    httpserver.expect_ordered_request(second_page_path, method='HEAD', headers=headers).respond_with_data()
-    httpserver.expect_ordered_request(second_page_path, method='GET', headers=headers).respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([
-                CrawlRequest(first_page_url, success_func=self.on_first_page_response),
-                CrawlRequest(second_page_url)
-            ])
+    first_page_response_data = _NEW_TAB_LINK_PAGE_HTML.format(second_page_url)
+    httpserver.expect_ordered_request(first_page_path,
+                                      method='GET').respond_with_data(content_type='text/html',
+                                                                      response_data=first_page_response_data)
+    httpserver.expect_ordered_request(second_page_path,
+                                      method='GET').respond_with_data(content_type='text/html',
+                                                                      response_data=_SECOND_PAGE_HTML)
 
-        def on_first_page_response(self, _: CrawlResponse) -> None:
-            self.set_cookie(Cookie('cookie_name', 'cookie_value'))
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
+        crawler.wait_for_pages(2, timeout=1000)
+        pages = crawler.get_pages()
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
+        assert len(pages) == 2
+        assert pages[1].url == second_page_url
+        assert pages[1].title == 'Second page'
 
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_switch_to_page_should_switch_to_specific_page_when_page_exists(httpserver: HTTPServer) -> None:
+def test_wait_for_pages_should_wait_until_new_page_navigates_away_from_blank_page(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     first_page_path = '/first-page'
     second_page_path = '/second-page'
     first_page_url = httpserver.url_for(first_page_path)
     second_page_url = httpserver.url_for(second_page_path)
-    first_page_response_data = f'''
-            <title>First page</title>
-            <a id="link" href="{second_page_url}" target="_blank">Go to second page</a>
-        '''
-    second_page_response_data = f'<title>Second page</title>'
-    httpserver.expect_ordered_request(first_page_path, method='HEAD').respond_with_data()
+    first_page_response_data = _DELAYED_NAVIGATION_NEW_TAB_LINK_PAGE_HTML.format(second_page_url)
     httpserver.expect_ordered_request(first_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
                                                                       response_data=first_page_response_data)
     httpserver.expect_ordered_request(second_page_path,
                                       method='GET').respond_with_data(content_type='text/html',
-                                                                      response_data=second_page_response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(first_page_url)])
+                                                                      response_data=_SECOND_PAGE_HTML)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            self.click('#link')
-            self.wait_for_timeout(500)
-            pages = self.get_pages()
-            self.switch_to_page(pages[1])
-            current_page = self.get_current_page()
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
+        crawler.wait_for_pages(2, timeout=5000)
+        pages = crawler.get_pages()
 
-            assert current_page.index == 1
-            assert current_page.url == second_page_url
-            assert current_page.title == 'Second page'
+        assert len(pages) == 2
+        assert pages[1].url == second_page_url
+        assert pages[1].title == 'Second page'
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(first_page_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_switch_to_page_should_raise_no_such_page_error_when_page_does_not_exist(httpserver: HTTPServer) -> None:
+def test_wait_for_pages_should_not_wait_for_timeout_when_new_page_fails_to_load(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NoSuchPageError) as exc_info:
-                self.switch_to_page(BrowserPage(1, request_url, 'Nonexistent'))
-
-            assert str(exc_info.value) == 'No page exists with index 1'
-
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
-
-    httpserver.check_assertions()
-
-
-def test_type_should_type_value_in_input_element_when_element_is_found(httpserver: HTTPServer) -> None:
-    request_path = '/page'
-    request_url = httpserver.url_for(request_path)
-    response_data = '<input type="text" id="test">'
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
+    # Nothing listens on port 1, so the new page shows an error page
+    response_data = _NEW_TAB_LINK_PAGE_HTML.format('http://127.0.0.1:1/')
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
                                                                                     response_data=response_data)
 
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            value = 'Test'
-            self.type('#test', value)
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        crawler.click('#link')
+        crawler.wait_for_pages(2, timeout=5000)
 
-            assert self.evaluate('#test', 'element => element.value') == value
+        assert len(crawler.get_pages()) == 2
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_type_should_raise_no_such_element_error_when_element_is_not_found(httpserver: HTTPServer) -> None:
+def test_wait_for_pages_should_raise_page_wait_timeout_error_when_pages_are_not_opened(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(NoSuchElementError) as exc_info:
-                self.type('#nonexistent', 'Test')
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-            assert str(exc_info.value) == 'Unable to locate element using selector #nonexistent'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        with pytest.raises(PageWaitTimeoutError, match=r'^Timeout 1ms exceeded waiting for 2 pages$'):
+            crawler.wait_for_pages(2, timeout=1)
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
 def test_wait_for_selector_should_wait_for_element_matching_selector_when_element_exists(
-        httpserver: HTTPServer) -> None:
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    response_data = '''
-        <script>
-            setTimeout(function() {
-                var element = document.createElement("div");
-                element.id = "test";
-                document.body.appendChild(element);
-            }, 500);
-        </script>
-    '''
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data(content_type='text/html')
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data(content_type='text/html',
-                                                                                    response_data=response_data)
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data(content_type='text/html',
+                                                                                    response_data=_DELAYED_ELEMENT_HTML)
 
-        def on_response_success(self, response: CrawlResponse) -> None:
-            assert self.find_element('#test') is None
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        assert crawler.find_element('#test') is None
 
-            self.wait_for_selector('#test', visible=True, timeout=1000)
+        crawler.wait_for_selector('#test', visible=True, timeout=1000)
 
-            assert self.find_element('#test') is not None
+        assert crawler.find_element('#test') is not None
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_wait_for_selector_should_raise_wait_timeout_error_when_element_does_not_exist(httpserver: HTTPServer) -> None:
+def test_wait_for_selector_should_raise_wait_timeout_error_when_element_does_not_exist(
+        httpserver: HTTPServer, browser_ws_endpoint: str) -> None:
     request_path = '/page'
     request_url = httpserver.url_for(request_path)
-    httpserver.expect_ordered_request(request_path, method='HEAD').respond_with_data()
-    httpserver.expect_ordered_request(request_path, method='GET').respond_with_data()
-
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([CrawlRequest(request_url)])
-
-        def on_response_success(self, response: CrawlResponse) -> None:
-            with pytest.raises(WaitTimeoutError) as exc_info:
-                self.wait_for_selector('#test', visible=True, timeout=1)
+    httpserver.expect_oneshot_request(request_path, method='GET').respond_with_data()
 
-            assert str(exc_info.value) == 'Timeout 1ms exceeded waiting for selector #test'
+    def on_response_success(crawler: Crawler, response: CrawlResponse) -> None:
+        with pytest.raises(WaitTimeoutError, match=r'^Timeout 1ms exceeded waiting for selector #test$'):
+            crawler.wait_for_selector('#test', visible=True, timeout=1)
 
-        def on_response_error(self, response: CrawlResponse) -> None:
-            assert False, f'Response error: {response}'
-
-    TestCrawler().start()
+    _MockCrawler([CrawlRequest(request_url)], browser_ws_endpoint, on_response_success=on_response_success).start()
 
     httpserver.check_assertions()
 
 
-def test_wait_for_timeout_should_wait_for_given_milliseconds(httpserver: HTTPServer) -> None:
-    class TestCrawler(Crawler):
-        def configure(self) -> CrawlerConfiguration:
-            return CrawlerConfiguration([])
-
-        def on_start(self) -> None:
-            start = timeit.default_timer()
-            self.wait_for_timeout(1000)
-            end = timeit.default_timer()
-            elapsed_time = end - start
+def test_wait_for_timeout_should_wait_for_given_milliseconds(browser_ws_endpoint: str) -> None:
+    def on_start(crawler: Crawler) -> None:
+        start = timeit.default_timer()
+        crawler.wait_for_timeout(100)
+        end = timeit.default_timer()
+        elapsed_time = end - start
 
-            assert 1 <= elapsed_time < 1.1
+        assert 0.1 <= elapsed_time < 0.2
 
-    TestCrawler().start()
+    _MockCrawler([], browser_ws_endpoint, on_start=on_start).start()
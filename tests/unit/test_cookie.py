@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from typing import Dict
+
 import pytest
 
 from silene.cookie import Cookie
@@ -68,6 +70,15 @@ def test_as_dict_should_return_cookie_as_a_dictionary() -> None:
     assert cookie.as_dict() == cookie_dict
 
 
+def test_as_dict_should_return_read_only_dictionary() -> None:
+    result = cookie.as_dict()
+
+    with pytest.raises(TypeError):
+        result['value'] = 'modified_value'
+
+    assert cookie.as_dict() == cookie_dict
+
+
 def test_from_dict_should_return_cookie_object_when_dictionary_contains_required_items() -> None:
     result = Cookie.from_dict(cookie_dict)
 
@@ -82,16 +93,14 @@ def test_from_dict_should_return_cookie_object_when_dictionary_contains_required
     assert result.same_site is None
 
 
-def test_from_dict_should_raise_value_error_when_dictionary_is_missing_required_key() -> None:
-    with pytest.raises(ValueError) as exc_info:
-        Cookie.from_dict({'value': 'cookie_value'})
-
-    assert str(exc_info.value) == f'Cookie dictionary is missing required key "name"'
-
-    with pytest.raises(ValueError) as exc_info:
-        Cookie.from_dict({'name': 'cookie_name'})
-
-    assert str(exc_info.value) == f'Cookie dictionary is missing required key "value"'
+@pytest.mark.parametrize('incomplete_cookie_dict, missing_key', [
+    ({'value': 'cookie_value'}, 'name'),
+    ({'name': 'cookie_name'}, 'value')
+])
+def test_from_dict_should_raise_value_error_when_dictionary_is_missing_required_key(
+        incomplete_cookie_dict: Dict[str, str], missing_key: str) -> None:
+    with pytest.raises(ValueError, match=f'^Cookie dictionary is missing required key "{missing_key}"$'):
+        Cookie.from_dict(incomplete_cookie_dict)
 
 
 def test_str_should_return_string_representation() -> None:
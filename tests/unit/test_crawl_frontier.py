@@ -39,6 +39,36 @@ def test_add_request_should_not_add_duplicate_request_to_queue_when_duplicate_re
     assert crawl_frontier.get_next_request() is None
 
 
+def test_add_request_should_not_add_duplicate_plain_request_to_queue_when_duplicate_request_filter_is_enabled() -> None:
+    crawler_configuration = CrawlerConfiguration([CrawlRequest(url='http://example.com/test')])
+    crawl_frontier = CrawlFrontier(crawler_configuration)
+    crawl_frontier.get_next_request()
+
+    result = crawl_frontier.add_request(CrawlRequest(url='http://example.com/test'))
+
+    assert result is False
+    assert crawl_frontier.get_next_request() is None
+
+
+def test_add_request_should_not_add_equivalent_request_to_queue_when_duplicate_request_filter_is_enabled() -> None:
+    crawler_configuration = CrawlerConfiguration([CrawlRequest(url='http://example.com/test')])
+    crawl_frontier = CrawlFrontier(crawler_configuration)
+    crawl_frontier.get_next_request()
+
+    result = crawl_frontier.add_request(CrawlRequest(url='http://EXAMPLE.com:80/test'))
+
+    assert result is False
+    assert crawl_frontier.get_next_request() is None
+
+
+def test_constructor_should_not_add_duplicate_seed_requests_to_queue_when_duplicate_request_filter_is_enabled() -> None:
+    crawler_configuration = CrawlerConfiguration([request, CrawlRequest(url='http://example.com')])
+    crawl_frontier = CrawlFrontier(crawler_configuration)
+
+    assert crawl_frontier.get_next_request() is request
+    assert crawl_frontier.get_next_request() is None
+
+
 def test_add_request_should_add_request_to_queue_when_offsite_request_filter_is_disabled() -> None:
     crawler_configuration = CrawlerConfiguration([], filter_offsite_requests=False, allowed_domains=['notexample.com'])
     crawl_frontier = CrawlFrontier(crawler_configuration)
@@ -69,6 +99,27 @@ def test_add_request_should_add_allowed_request_to_queue_when_offsite_request_fi
     assert crawl_frontier.get_next_request() is request
 
 
+def test_add_request_should_add_subdomain_request_to_queue_when_offsite_request_filter_is_enabled() -> None:
+    crawler_configuration = CrawlerConfiguration([], filter_offsite_requests=True, allowed_domains=['example.com'])
+    crawl_frontier = CrawlFrontier(crawler_configuration)
+    subdomain_request = CrawlRequest(url='http://www.example.com')
+
+    result = crawl_frontier.add_request(subdomain_request)
+
+    assert result is True
+    assert crawl_frontier.get_next_request() is subdomain_request
+
+
+def test_add_request_should_not_add_lookalike_request_to_queue_when_offsite_request_filter_is_enabled() -> None:
+    crawler_configuration = CrawlerConfiguration([], filter_offsite_requests=True, allowed_domains=['example.com'])
+    crawl_frontier = CrawlFrontier(crawler_configuration)
+
+    result = crawl_frontier.add_request(CrawlRequest(url='http://notexample.com'))
+
+    assert result is False
+    assert crawl_frontier.get_next_request() is None
+
+
 def test_has_next_request_should_return_false_when_queue_is_empty() -> None:
     crawler_configuration = CrawlerConfiguration([])
     crawl_frontier = CrawlFrontier(crawler_configuration)
@@ -103,3 +154,13 @@ def test_get_next_request_should_return_next_request_with_higher_priority() -> N
     crawl_frontier = CrawlFrontier(crawler_configuration)
 
     assert crawl_frontier.get_next_request() is high_priority_request
+
+
+def test_get_next_request_should_return_requests_with_equal_priority_in_insertion_order() -> None:
+    first_request = CrawlRequest('http://example.com/first')
+    second_request = CrawlRequest('http://example.com/second')
+    crawler_configuration = CrawlerConfiguration([first_request, second_request])
+    crawl_frontier = CrawlFrontier(crawler_configuration)
+
+    assert crawl_frontier.get_next_request() is first_request
+    assert crawl_frontier.get_next_request() is second_request
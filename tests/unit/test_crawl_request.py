@@ -49,10 +49,40 @@ def test_url_should_return_request_url() -> None:
     assert CrawlRequest(url).url == url
 
 
+def test_url_should_return_request_url_when_url_is_str_subclass() -> None:
+    class _Url(str):
+        pass
+
+    url = _Url('https://example.com')
+
+    assert CrawlRequest(url).url == url
+
+
 def test_domain_should_return_request_domain() -> None:
     assert CrawlRequest('https://example.com').domain == 'example.com'
 
 
+def test_normalized_url_should_return_url_when_url_is_already_normalized() -> None:
+    url = 'https://example.com/test'
+
+    assert CrawlRequest(url).normalized_url == url
+
+
+def test_normalized_url_should_return_normalized_request_url() -> None:
+    request = CrawlRequest('https://user@Example.COM:443/test?ghi=jkl&abc=def#fragment')
+
+    assert request.normalized_url == 'https://user@example.com/test?abc=def&ghi=jkl'
+
+
+def test_normalized_url_should_lowercase_scheme_when_url_has_no_query() -> None:
+    assert CrawlRequest('HTTPS://example.com/test').normalized_url == 'https://example.com/test'
+
+
+def test_normalized_url_should_remove_empty_params_regardless_of_empty_query() -> None:
+    assert CrawlRequest('https://example.com/test;').normalized_url == 'https://example.com/test'
+    assert CrawlRequest('https://example.com/test;?').normalized_url == 'https://example.com/test'
+
+
 def test_headers_should_return_request_headers() -> None:
     headers = {'foo': 'bar'}
 
@@ -17,11 +17,9 @@ from silene.crawler_configuration import CrawlerConfiguration
 
 
 def test_constructor_should_raise_value_error_when_invalid_domain_in_allowed_domains() -> None:
-    with pytest.raises(ValueError) as exc_info:
+    with pytest.raises(ValueError, match=r'^Could not extract a valid domain from example\.invalid$'):
         CrawlerConfiguration([], allowed_domains=['example.invalid'])
 
-    assert str(exc_info.value) == 'Could not extract a valid domain from example.invalid'
-
 
 def test_seed_requests_should_return_seed_requests() -> None:
     seed_requests = [CrawlRequest('https://example.com')]
@@ -66,12 +64,27 @@ def test_allowed_domains_should_return_domains_only() -> None:
     assert crawler_configuration.allowed_domains == ['www.example.com']
 
 
+def test_browser_ws_endpoint_should_return_none_when_not_specified() -> None:
+    crawler_configuration = CrawlerConfiguration([])
+
+    assert crawler_configuration.browser_ws_endpoint is None
+
+
+def test_browser_ws_endpoint_should_return_specified_value_when_specified() -> None:
+    browser_ws_endpoint = 'ws://127.0.0.1:9222/devtools/browser/id'
+    crawler_configuration = CrawlerConfiguration([], browser_ws_endpoint=browser_ws_endpoint)
+
+    assert crawler_configuration.browser_ws_endpoint == browser_ws_endpoint
+
+
 def test_str_should_return_string_representation() -> None:
     crawler_configuration = CrawlerConfiguration([CrawlRequest('https://example.com')],
                                                  filter_offsite_requests=True,
-                                                 allowed_domains=['example.com'])
+                                                 allowed_domains=['example.com'],
+                                                 browser_ws_endpoint='ws://127.0.0.1:9222/devtools/browser/test')
 
     assert str(crawler_configuration) == 'CrawlerConfiguration(seed_requests=1 requests, ' \
                                          'filter_duplicate_requests=True, ' \
                                          'filter_offsite_requests=True, ' \
-                                         'allowed_domains=1 domains)'
+                                         'allowed_domains=1 domains, ' \
+                                         'browser_ws_endpoint=ws://127.0.0.1:9222/devtools/browser/test)'
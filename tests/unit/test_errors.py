@@ -10,55 +10,31 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from silene.errors import CrawlerNotRunningError, NoSuchPageError, NoSuchElementError, WaitTimeoutError, \
-    NavigationTimeoutError
-
-
-class TestCrawlerNotRunningError:
-    error: CrawlerNotRunningError = CrawlerNotRunningError()
-
-    def test_message_should_return_error_message(self) -> None:
-        assert self.error.message == 'Crawler is not running'
-
-    def test_str_should_return_string_representation(self) -> None:
-        assert str(self.error) == 'Crawler is not running'
-
-
-class TestNoSuchPageError:
-    error: NoSuchPageError = NoSuchPageError(index=0)
-
-    def test_message_should_return_error_message(self) -> None:
-        assert self.error.message == 'No page exists with index 0'
-
-    def test_str_should_return_string_representation(self) -> None:
-        assert str(self.error) == 'No page exists with index 0'
-
+from typing import Union
 
-class TestNoSuchElementError:
-    error: NoSuchElementError = NoSuchElementError(selector='#test')
+import pytest
 
-    def test_message_should_return_error_message(self) -> None:
-        assert self.error.message == 'Unable to locate element using selector #test'
-
-    def test_str_should_return_string_representation(self) -> None:
-        assert str(self.error) == 'Unable to locate element using selector #test'
-
-
-class TestWaitTimeoutError:
-    error: WaitTimeoutError = WaitTimeoutError(selector='#test', timeout=1000)
-
-    def test_message_should_return_error_message(self) -> None:
-        assert self.error.message == 'Timeout 1000ms exceeded waiting for selector #test'
-
-    def test_str_should_return_string_representation(self) -> None:
-        assert str(self.error) == 'Timeout 1000ms exceeded waiting for selector #test'
-
-
-class TestNavigationTimeoutError:
-    error: NavigationTimeoutError = NavigationTimeoutError(timeout=1000)
-
-    def test_message_should_return_error_message(self) -> None:
-        assert self.error.message == 'Timeout 1000ms exceeded waiting for navigation'
-
-    def test_str_should_return_string_representation(self) -> None:
-        assert str(self.error) == 'Timeout 1000ms exceeded waiting for navigation'
+from silene.errors import CrawlerNotRunningError, NoSuchPageError, NoSuchElementError, WaitTimeoutError, \
+    NavigationTimeoutError, PageWaitTimeoutError
+
+
+@pytest.mark.parametrize('error, expected_message', [
+    pytest.param(CrawlerNotRunningError(), 'Crawler is not running', id='crawler_not_running'),
+    pytest.param(NoSuchPageError(index=0), 'No page exists with index 0', id='no_such_page'),
+    pytest.param(NoSuchElementError(selector='#test'), 'Unable to locate element using selector #test',
+                 id='no_such_element'),
+    pytest.param(WaitTimeoutError(selector='#test', timeout=1000), 'Timeout 1000ms exceeded waiting for selector #test',
+                 id='wait_timeout'),
+    pytest.param(NavigationTimeoutError(timeout=1000), 'Timeout 1000ms exceeded waiting for navigation',
+                 id='navigation_timeout'),
+    pytest.param(PageWaitTimeoutError(timeout=1000, count=2), 'Timeout 1000ms exceeded waiting for 2 pages',
+                 id='page_wait_timeout'),
+    pytest.param(PageWaitTimeoutError(timeout=1000, count=1), 'Timeout 1000ms exceeded waiting for 1 page',
+                 id='page_wait_timeout_single_page')
+])
+def test_error_should_return_error_message_as_message_and_string_representation(
+        error: Union[CrawlerNotRunningError, NoSuchPageError, NoSuchElementError, WaitTimeoutError,
+                     NavigationTimeoutError, PageWaitTimeoutError],
+        expected_message: str) -> None:
+    assert error.message == expected_message
+    assert str(error) == expected_message